@@ -1,63 +1,145 @@
 from pathlib import Path
-from typing import Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
 
 import pandas as pd
 from rich.console import Console
 from rich.table import Table
 from sqlalchemy.exc import SQLAlchemyError
 
-
-def load_dataframes(engine) -> Tuple[pd.DataFrame, pd.DataFrame]:
+from instrumentation import measure_stage
+from models import RATING_BINS, RATING_LABELS
+
+
+MOVIE_DTYPES: Dict[str, str] = {
+    "id": "int32",
+    "year": "int16",
+    "rating": "float32",
+}
+
+SERIES_DTYPES: Dict[str, str] = {
+    "id": "int32",
+    "year": "int16",
+    "seasons": "int16",
+    "episodes": "int32",
+}
+
+SUMMARY_COLUMNS: List[str] = ["id", "year", "rating"]
+
+DEFAULT_CHUNKSIZE: int = 50000
+
+EXPORT_FILE_NAMES: List[str] = ["movies.csv", "series.csv", "movies.json", "series.json"]
+EXPORT_VERSION_FILE_NAME: str = "export_version.txt"
+
+
+def apply_compact_dtypes(dataframe: pd.DataFrame, dtypes: Dict[str, str]) -> pd.DataFrame:
+    selected_dtypes: Dict[str, str] = {}
+    for column_name in dataframe.columns:
+        if column_name in dtypes:
+            selected_dtypes[column_name] = dtypes[column_name]
+
+    if len(selected_dtypes) == 0:
+        return dataframe
+    return dataframe.astype(selected_dtypes)
+
+
+def iter_table_chunks(
+        engine,
+        table_name: str,
+        dtypes: Dict[str, str],
+        columns: Optional[List[str]] = None,
+        chunksize: int = DEFAULT_CHUNKSIZE,
+) -> Iterator[pd.DataFrame]:
+    for chunk in pd.read_sql_table(table_name, con=engine, columns=columns, chunksize=chunksize):
+        yield apply_compact_dtypes(chunk, dtypes)
+
+
+def read_table(
+        engine,
+        table_name: str,
+        dtypes: Dict[str, str],
+        columns: Optional[List[str]] = None,
+        chunksize: Optional[int] = DEFAULT_CHUNKSIZE,
+) -> pd.DataFrame:
+    if chunksize is None:
+        dataframe = pd.read_sql_table(table_name, con=engine, columns=columns)
+        return apply_compact_dtypes(dataframe, dtypes)
+
+    chunks: List[pd.DataFrame] = []
+    for chunk in iter_table_chunks(engine, table_name, dtypes, columns, chunksize):
+        chunks.append(chunk)
+
+    if len(chunks) == 0:
+        empty_df = pd.read_sql_table(table_name, con=engine, columns=columns)
+        return apply_compact_dtypes(empty_df, dtypes)
+    if len(chunks) == 1:
+        return chunks[0]
+    return pd.concat(chunks, ignore_index=True)
+
+
+def load_dataframes(
+        engine,
+        movie_columns: Optional[List[str]] = None,
+        series_columns: Optional[List[str]] = None,
+        chunksize: Optional[int] = DEFAULT_CHUNKSIZE,
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
     movies_df = pd.DataFrame()
     series_df = pd.DataFrame()
     console = Console()
 
-    try:
-        movies_df = pd.read_sql_table("movies", con=engine)
-    except SQLAlchemyError as error:
-        console.print("Erro ao ler tabela movies:", str(error), style="bold red")
-    except ValueError as error:
-        console.print("Erro ao ler tabela movies:", str(error), style="bold red")
+    with measure_stage("analysis.load_dataframes") as stage:
+        try:
+            movies_df = read_table(engine, "movies", MOVIE_DTYPES, movie_columns, chunksize)
+        except SQLAlchemyError as error:
+            console.print("Erro ao ler tabela movies:", str(error), style="bold red")
+        except ValueError as error:
+            console.print("Erro ao ler tabela movies:", str(error), style="bold red")
 
-    try:
-        series_df = pd.read_sql_table("series", con=engine)
-    except SQLAlchemyError as error:
-        console.print("Erro ao ler tabela series:", str(error), style="bold red")
-    except ValueError as error:
-        console.print("Erro ao ler tabela series:", str(error), style="bold red")
+        try:
+            series_df = read_table(engine, "series", SERIES_DTYPES, series_columns, chunksize)
+        except SQLAlchemyError as error:
+            console.print("Erro ao ler tabela series:", str(error), style="bold red")
+        except ValueError as error:
+            console.print("Erro ao ler tabela series:", str(error), style="bold red")
+
+        stage.add_rows(len(movies_df) + len(series_df))
+        stage.add_bytes(int(movies_df.memory_usage().sum() + series_df.memory_usage().sum()))
 
     return movies_df, series_df
 
 
-def classify_rating(rating: float) -> str:
-    if rating >= 9.0:
-        return "Obra-prima"
-    if rating >= 8.0:
-        return "Excelente"
-    if rating >= 7.0:
-        return "Bom"
-    return "Mediano"
+def classify_ratings(ratings: pd.Series) -> pd.Series:
+    return pd.cut(ratings, bins=RATING_BINS, labels=RATING_LABELS, right=False)
 
 
 def add_category_column(movies_df: pd.DataFrame) -> pd.DataFrame:
     if movies_df.empty:
         return movies_df
 
-    result_df = movies_df.copy()
-    result_df["categoria"] = result_df["rating"].apply(classify_rating)
+    with measure_stage("analysis.add_category_column") as stage:
+        result_df = movies_df.copy(deep=False)
+        result_df["categoria"] = classify_ratings(result_df["rating"])
+        stage.add_rows(len(result_df))
     return result_df
 
 
-def show_top_movies(movies_df: pd.DataFrame) -> None:
+def select_top_movies(movies_df: pd.DataFrame, limit: int = 5, min_rating: float = 9.0) -> pd.DataFrame:
+    if movies_df.empty:
+        return movies_df
+
+    top_df = movies_df.nlargest(limit, "rating")
+    return top_df[top_df["rating"] > min_rating]
+
+
+def show_top_movies(movies_df: pd.DataFrame, top_df: Optional[pd.DataFrame] = None) -> None:
     console = Console()
 
     if movies_df.empty:
         console.print("Nenhum filme carregado para análise.", style="bold yellow")
         return
 
-    sorted_df = movies_df.sort_values(by="rating", ascending=False)
-    filtered_df = sorted_df[sorted_df["rating"] > 9.0]
-    head_df = filtered_df.head(5)
+    head_df = top_df
+    if head_df is None:
+        head_df = select_top_movies(movies_df)
 
     console.rule("[bold cyan]Top 5 filmes com nota maior que 9.0[/bold cyan]")
 
@@ -103,59 +185,139 @@ def show_title_rating_category(movies_df: pd.DataFrame, limit: int) -> None:
     console.print(table)
 
 
-def build_category_summary(movies_df: pd.DataFrame) -> pd.DataFrame:
-    if movies_df.empty:
-        return pd.DataFrame()
-
-    if "categoria" not in movies_df.columns:
+def pivot_category_counts(counts: pd.DataFrame) -> pd.DataFrame:
+    if counts.empty:
         return pd.DataFrame()
 
-    grouped = movies_df.groupby(["categoria", "year"])
-    counts = grouped["id"].count().reset_index(name="quantidade")
+    counts = counts.astype({"categoria": "str", "year": "int64"})
     pivot_table = counts.pivot(
         index="categoria",
         columns="year",
         values="quantidade",
     )
+    pivot_table = pivot_table.sort_index()
+    pivot_table = pivot_table.sort_index(axis=1)
     pivot_table = pivot_table.fillna(0)
     pivot_table = pivot_table.astype(int)
+    return pivot_table
+
+
+def build_category_summary(movies_df: pd.DataFrame) -> pd.DataFrame:
+    if movies_df.empty:
+        return pd.DataFrame()
+
+    if "categoria" not in movies_df.columns:
+        return pd.DataFrame()
+
+    with measure_stage("analysis.build_category_summary") as stage:
+        grouped = movies_df.groupby(["categoria", "year"], observed=True)
+        counts = grouped["id"].count().reset_index(name="quantidade")
+        pivot_table = pivot_category_counts(counts)
+        stage.add_rows(len(movies_df))
 
     return pivot_table
 
 
+def count_categories_by_year(engine, chunksize: int = DEFAULT_CHUNKSIZE) -> pd.DataFrame:
+    partial_counts: List[pd.DataFrame] = []
+    for chunk in iter_table_chunks(engine, "movies", MOVIE_DTYPES, SUMMARY_COLUMNS, chunksize):
+        chunk_with_category = add_category_column(chunk)
+        if chunk_with_category.empty:
+            continue
+        grouped = chunk_with_category.groupby(["categoria", "year"], observed=True)
+        partial_counts.append(grouped["id"].count().reset_index(name="quantidade"))
+
+    if len(partial_counts) == 0:
+        return pd.DataFrame(columns=["categoria", "year", "quantidade"])
+
+    counts = pd.concat(partial_counts, ignore_index=True)
+    counts = counts.astype({"categoria": "str", "year": "int64"})
+    counts = counts.groupby(["categoria", "year"], as_index=False)["quantidade"].sum()
+    return counts
+
+
 def export_dataframes(
         movies_df: pd.DataFrame,
         series_df: pd.DataFrame,
         output_dir: Path,
-) -> None:
+) -> bool:
     console = Console()
     output_dir.mkdir(parents=True, exist_ok=True)
-
-    movies_csv_path = output_dir / "movies.csv"
-    series_csv_path = output_dir / "series.csv"
-    movies_json_path = output_dir / "movies.json"
-    series_json_path = output_dir / "series.json"
+    saved_count = 0
+
+    with measure_stage("analysis.export_dataframes") as stage:
+        movies_csv_path = output_dir / "movies.csv"
+        series_csv_path = output_dir / "series.csv"
+        movies_json_path = output_dir / "movies.json"
+        series_json_path = output_dir / "series.json"
+
+        try:
+            movies_df.to_csv(movies_csv_path, index=False)
+            console.print(f"Arquivo salvo: {movies_csv_path}", style="green")
+            saved_count = saved_count + 1
+        except OSError as error:
+            console.print("Erro ao salvar movies.csv:", str(error), style="bold red")
+
+        try:
+            series_df.to_csv(series_csv_path, index=False)
+            console.print(f"Arquivo salvo: {series_csv_path}", style="green")
+            saved_count = saved_count + 1
+        except OSError as error:
+            console.print("Erro ao salvar series.csv:", str(error), style="bold red")
+
+        try:
+            movies_df.to_json(
+                movies_json_path,
+                orient="records",
+                force_ascii=False,
+                double_precision=6,
+            )
+            console.print(f"Arquivo salvo: {movies_json_path}", style="green")
+            saved_count = saved_count + 1
+        except OSError as error:
+            console.print("Erro ao salvar movies.json:", str(error), style="bold red")
+
+        try:
+            series_df.to_json(
+                series_json_path,
+                orient="records",
+                force_ascii=False,
+                double_precision=6,
+            )
+            console.print(f"Arquivo salvo: {series_json_path}", style="green")
+            saved_count = saved_count + 1
+        except OSError as error:
+            console.print("Erro ao salvar series.json:", str(error), style="bold red")
+
+        for path in [movies_csv_path, series_csv_path, movies_json_path, series_json_path]:
+            if path.exists():
+                stage.add_bytes(path.stat().st_size)
+        stage.add_rows(len(movies_df) + len(series_df))
+
+    return saved_count == len(EXPORT_FILE_NAMES)
+
+
+def exported_files_are_current(output_dir: Path, data_version: int) -> bool:
+    version_path = output_dir / EXPORT_VERSION_FILE_NAME
+    if not version_path.exists():
+        return False
+
+    for file_name in EXPORT_FILE_NAMES:
+        if not (output_dir / file_name).exists():
+            return False
 
     try:
-        movies_df.to_csv(movies_csv_path, index=False)
-        console.print(f"Arquivo salvo: {movies_csv_path}", style="green")
-    except OSError as error:
-        console.print("Erro ao salvar movies.csv:", str(error), style="bold red")
+        version_text = version_path.read_text(encoding="utf-8").strip()
+    except OSError:
+        return False
+    return version_text == str(data_version)
 
-    try:
-        series_df.to_csv(series_csv_path, index=False)
-        console.print(f"Arquivo salvo: {series_csv_path}", style="green")
-    except OSError as error:
-        console.print("Erro ao salvar series.csv:", str(error), style="bold red")
 
-    try:
-        movies_df.to_json(movies_json_path, orient="records", force_ascii=False)
-        console.print(f"Arquivo salvo: {movies_json_path}", style="green")
-    except OSError as error:
-        console.print("Erro ao salvar movies.json:", str(error), style="bold red")
+def write_export_version(output_dir: Path, data_version: int) -> None:
+    console = Console()
+    version_path = output_dir / EXPORT_VERSION_FILE_NAME
 
     try:
-        series_df.to_json(series_json_path, orient="records", force_ascii=False)
-        console.print(f"Arquivo salvo: {series_json_path}", style="green")
+        version_path.write_text(str(data_version), encoding="utf-8")
     except OSError as error:
-        console.print("Erro ao salvar series.json:", str(error), style="bold red")
+        console.print("Erro ao salvar a versão da exportação:", str(error), style="bold red")
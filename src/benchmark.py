@@ -0,0 +1,391 @@
+import argparse
+import gc
+import json
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+from rich.console import Console
+from rich.table import Table
+
+from analysis import (
+    load_dataframes,
+    add_category_column,
+    build_category_summary,
+    export_dataframes,
+)
+from chart_generator import write_chart_html
+from database import (
+    create_sqlite_engine,
+    create_database_schema,
+    delete_movies,
+    insert_movies_and_series,
+)
+from main import create_movie_objects, create_series_from_scraping
+from models import Movie
+from scraping import extract_chart_items_from_html, load_html_from_file
+from summary import summary_matches_full_recompute, verify_category_summary
+
+console = Console()
+
+DEFAULT_SIZES: List[int] = [250, 2500, 25000]
+DEFAULT_TIME_THRESHOLD: float = 0.25
+DEFAULT_MEMORY_THRESHOLD: float = 0.25
+CHANGED_FRACTION: float = 0.01
+SINGLE_RUN_SIZE: int = 25000
+
+STAGE_NAMES: List[str] = [
+    "extract_chart_items_from_html",
+    "insert_movies_and_series",
+    "verify_category_summary",
+    "load_dataframes",
+    "add_category_column",
+    "build_category_summary",
+    "export_dataframes",
+]
+
+
+def time_call(function: Callable[[], Any]) -> Tuple[Any, float]:
+    gc.collect()
+    start = time.perf_counter()
+    result = function()
+    elapsed = time.perf_counter() - start
+    return result, elapsed
+
+
+def trace_call(function: Callable[[], Any]) -> Tuple[Any, int]:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = function()
+        _, peak_bytes = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, peak_bytes
+
+
+def pick_changed_movies(movies: List[Movie], seed: int) -> Tuple[List[Movie], List[str]]:
+    rng = random.Random(seed)
+    changed_count = max(int(len(movies) * CHANGED_FRACTION), 1)
+    sample = rng.sample(movies, min(changed_count * 2, len(movies)))
+
+    changed_movies: List[Movie] = []
+    for movie in sample[:changed_count]:
+        new_rating = round(min(max(movie.rating + rng.choice([-1.0, -0.5, 0.5, 1.0]), 1.0), 10.0), 1)
+        changed_movies.append(Movie(title=movie.title, year=movie.year, rating=new_rating))
+
+    removed_titles: List[str] = []
+    for movie in sample[changed_count:]:
+        removed_titles.append(movie.title)
+
+    return changed_movies, removed_titles
+
+
+def run_pipeline(
+        movies_html_path: Path,
+        series_html_path: Path,
+        n_items: int,
+        work_dir: Path,
+        measure: Callable[[Callable[[], Any]], Tuple[Any, Any]],
+) -> Dict[str, Any]:
+    measurements: Dict[str, Any] = {}
+    movies_html = load_html_from_file(movies_html_path)
+    series_html = load_html_from_file(series_html_path)
+
+    def extract_both():
+        raw_movies = extract_chart_items_from_html(html=movies_html, limit=n_items)
+        raw_series = extract_chart_items_from_html(html=series_html, limit=n_items)
+        return raw_movies, raw_series
+
+    raw_items, measurements["extract_chart_items_from_html"] = measure(extract_both)
+    raw_movies, raw_series = raw_items
+    del movies_html
+    del series_html
+
+    movies = create_movie_objects(raw_movies)
+    series_list = create_series_from_scraping(raw_series)
+
+    engine = create_sqlite_engine(work_dir / "benchmark.db")
+    create_database_schema(engine)
+
+    _, measurements["insert_movies_and_series"] = measure(
+        lambda: insert_movies_and_series(engine, movies, series_list)
+    )
+
+    changed_movies, removed_titles = pick_changed_movies(movies, n_items)
+    insert_movies_and_series(engine, changed_movies, [])
+    delete_movies(engine, removed_titles)
+    if not summary_matches_full_recompute(engine):
+        raise RuntimeError("Resumo incremental diverge do recálculo completo.")
+
+    _, measurements["verify_category_summary"] = measure(
+        lambda: verify_category_summary(engine)
+    )
+
+    frames, measurements["load_dataframes"] = measure(lambda: load_dataframes(engine))
+    movies_df, series_df = frames
+
+    movies_with_category, measurements["add_category_column"] = measure(
+        lambda: add_category_column(movies_df)
+    )
+
+    _, measurements["build_category_summary"] = measure(
+        lambda: build_category_summary(movies_with_category)
+    )
+
+    _, measurements["export_dataframes"] = measure(
+        lambda: export_dataframes(
+            movies_df=movies_with_category,
+            series_df=series_df,
+            output_dir=work_dir / "export",
+        )
+    )
+
+    engine.dispose()
+    return measurements
+
+
+def benchmark_size(
+        n_items: int,
+        seed: int,
+        repeat: int,
+        with_memory: bool,
+) -> Dict[str, Dict[str, float]]:
+    if n_items > SINGLE_RUN_SIZE:
+        repeat = 1
+
+    with tempfile.TemporaryDirectory() as html_dir:
+        movies_html_path = Path(html_dir) / "movies.html"
+        series_html_path = Path(html_dir) / "series.html"
+        write_chart_html(movies_html_path, n_items, seed=seed, is_series=False)
+        write_chart_html(series_html_path, n_items, seed=seed + 1, is_series=True)
+
+        timings: Dict[str, float] = {}
+        run_index = 0
+        while run_index < repeat:
+            with tempfile.TemporaryDirectory() as temp_dir:
+                run_timings = run_pipeline(
+                    movies_html_path,
+                    series_html_path,
+                    n_items,
+                    Path(temp_dir),
+                    time_call,
+                )
+            for stage_name, seconds in run_timings.items():
+                if stage_name not in timings or seconds < timings[stage_name]:
+                    timings[stage_name] = seconds
+            run_index = run_index + 1
+
+        peaks: Dict[str, Any] = {}
+        if with_memory:
+            with tempfile.TemporaryDirectory() as temp_dir:
+                peaks = run_pipeline(
+                    movies_html_path,
+                    series_html_path,
+                    n_items,
+                    Path(temp_dir),
+                    trace_call,
+                )
+
+    stage_results: Dict[str, Dict[str, float]] = {}
+    for stage_name in STAGE_NAMES:
+        stage_result: Dict[str, float] = {}
+        stage_result["seconds"] = round(timings[stage_name], 6)
+        if stage_name in peaks:
+            stage_result["peak_bytes"] = peaks[stage_name]
+        stage_results[stage_name] = stage_result
+
+    return stage_results
+
+
+def run_benchmarks(
+        sizes: List[int],
+        seed: int,
+        repeat: int,
+        with_memory: bool,
+) -> Dict[str, Any]:
+    results: Dict[str, Any] = {}
+    for n_items in sizes:
+        console.rule(f"[bold cyan]Benchmark com {n_items} itens[/bold cyan]")
+        results[str(n_items)] = benchmark_size(n_items, seed, repeat, with_memory)
+
+    report: Dict[str, Any] = {}
+    report["created_at"] = datetime.now(timezone.utc).isoformat()
+    report["python"] = platform.python_version()
+    report["platform"] = platform.platform()
+    report["seed"] = seed
+    report["repeat"] = repeat
+    report["sizes"] = sizes
+    report["results"] = results
+    return report
+
+
+def save_report(report: Dict[str, Any], path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(report, file, indent=2)
+    console.print(f"Arquivo salvo: {path}", style="green")
+
+
+def load_report(path: Path) -> Dict[str, Any]:
+    with open(path, "r", encoding="utf-8") as file:
+        report: Dict[str, Any] = json.load(file)
+    return report
+
+
+def compare_reports(
+        current: Dict[str, Any],
+        baseline: Dict[str, Any],
+        time_threshold: float,
+        memory_threshold: float,
+) -> List[Dict[str, Any]]:
+    comparisons: List[Dict[str, Any]] = []
+    baseline_results: Dict[str, Any] = baseline.get("results", {})
+
+    for size_key, stages in current["results"].items():
+        if size_key not in baseline_results:
+            continue
+
+        for stage_name, stage_result in stages.items():
+            baseline_stage = baseline_results[size_key].get(stage_name)
+            if baseline_stage is None:
+                continue
+
+            metrics: List[Tuple[str, float]] = [
+                ("seconds", time_threshold),
+                ("peak_bytes", memory_threshold),
+            ]
+            for metric_name, threshold in metrics:
+                if metric_name not in stage_result or metric_name not in baseline_stage:
+                    continue
+
+                baseline_value = float(baseline_stage[metric_name])
+                current_value = float(stage_result[metric_name])
+                if baseline_value > 0:
+                    ratio = current_value / baseline_value
+                else:
+                    ratio = 1.0
+
+                comparison: Dict[str, Any] = {}
+                comparison["size"] = int(size_key)
+                comparison["stage"] = stage_name
+                comparison["metric"] = metric_name
+                comparison["baseline"] = baseline_value
+                comparison["current"] = current_value
+                comparison["ratio"] = ratio
+                comparison["regression"] = ratio > 1.0 + threshold
+                comparisons.append(comparison)
+
+    return comparisons
+
+
+def show_comparisons(comparisons: List[Dict[str, Any]]) -> None:
+    console.rule("[bold cyan]Comparação com o baseline[/bold cyan]")
+
+    table = Table(show_header=True, header_style="bold magenta")
+    table.add_column("Itens", justify="right")
+    table.add_column("Etapa")
+    table.add_column("Métrica")
+    table.add_column("Baseline", justify="right")
+    table.add_column("Atual", justify="right")
+    table.add_column("Razão", justify="right")
+
+    for comparison in comparisons:
+        style = "green"
+        if comparison["regression"]:
+            style = "bold red"
+        table.add_row(
+            str(comparison["size"]),
+            comparison["stage"],
+            comparison["metric"],
+            f"{comparison['baseline']:.4f}",
+            f"{comparison['current']:.4f}",
+            f"{comparison['ratio']:.2f}x",
+            style=style,
+        )
+
+    console.print(table)
+
+
+def show_report(report: Dict[str, Any]) -> None:
+    console.rule("[bold cyan]Resultados do benchmark[/bold cyan]")
+
+    table = Table(show_header=True, header_style="bold magenta")
+    table.add_column("Itens", justify="right")
+    table.add_column("Etapa")
+    table.add_column("Tempo (s)", justify="right")
+    table.add_column("Pico de memória (MiB)", justify="right")
+
+    for size_key, stages in report["results"].items():
+        for stage_name, stage_result in stages.items():
+            peak_text = "-"
+            if "peak_bytes" in stage_result:
+                peak_text = f"{stage_result['peak_bytes'] / (1024 * 1024):.2f}"
+            table.add_row(size_key, stage_name, f"{stage_result['seconds']:.4f}", peak_text)
+
+    console.print(table)
+
+
+def parse_arguments(arguments: List[str]) -> argparse.Namespace:
+    base_dir: Path = Path(__file__).resolve().parent.parent
+    data_dir: Path = base_dir / "data"
+
+    parser = argparse.ArgumentParser(description="Benchmark do pipeline do IMDb Top 250.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", type=Path, default=data_dir / "benchmark_results.json")
+    parser.add_argument("--baseline", type=Path, default=data_dir / "benchmark_baseline.json")
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--no-memory", action="store_true")
+    parser.add_argument("--time-threshold", type=float, default=DEFAULT_TIME_THRESHOLD)
+    parser.add_argument("--memory-threshold", type=float, default=DEFAULT_MEMORY_THRESHOLD)
+    return parser.parse_args(arguments)
+
+
+def main(arguments: List[str]) -> int:
+    options = parse_arguments(arguments)
+
+    report = run_benchmarks(
+        options.sizes,
+        options.seed,
+        max(options.repeat, 1),
+        not options.no_memory,
+    )
+    show_report(report)
+    save_report(report, options.output)
+
+    if options.save_baseline:
+        save_report(report, options.baseline)
+        return 0
+
+    if not options.baseline.exists():
+        console.print("Baseline não encontrado. Use --save-baseline para criá-lo.", style="bold yellow")
+        return 0
+
+    baseline = load_report(options.baseline)
+    comparisons = compare_reports(
+        report,
+        baseline,
+        options.time_threshold,
+        options.memory_threshold,
+    )
+    show_comparisons(comparisons)
+
+    regressions = [comparison for comparison in comparisons if comparison["regression"]]
+    if len(regressions) > 0:
+        console.print(f"{len(regressions)} regressões acima do limite.", style="bold red")
+        return 1
+
+    console.print("Nenhuma regressão acima do limite.", style="bold green")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
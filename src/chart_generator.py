@@ -0,0 +1,116 @@
+import random
+from pathlib import Path
+from typing import Iterator, List
+
+TITLE_WORDS: List[str] = [
+    "Shadow", "River", "Empire", "Silent", "Golden", "Last", "Night", "City",
+    "Dream", "Storm", "Winter", "Iron", "Lost", "Crimson", "Ocean", "Secret",
+    "Broken", "Wild", "Glass", "Burning", "Northern", "Hidden", "Eternal", "Paper",
+    "Kingdom", "Garden", "Road", "House", "Heart", "Machine", "Mirror", "Star",
+]
+
+CERTIFICATES: List[str] = ["G", "PG", "PG-13", "R", "TV-14", "TV-MA", "Not Rated"]
+
+HTML_HEADER: str = (
+    "<!DOCTYPE html><html lang=\"en-US\"><head><meta charset=\"utf-8\">"
+    "<title>IMDb Top Chart</title></head><body><main><section>"
+    "<ul class=\"ipc-metadata-list ipc-metadata-list--dividers-between "
+    "sc-a1e81754-0 ipc-metadata-list--base\" role=\"presentation\">"
+)
+
+HTML_FOOTER: str = "</ul></section></main></body></html>"
+
+
+def build_title(rng: random.Random, position: int) -> str:
+    first_word = rng.choice(TITLE_WORDS)
+    second_word = rng.choice(TITLE_WORDS)
+    return f"The {first_word} {second_word} {position}"
+
+
+def build_year_text(rng: random.Random, is_series: bool) -> str:
+    start_year = rng.randint(1920, 2024)
+    if not is_series:
+        return str(start_year)
+
+    if rng.random() < 0.4:
+        return f"{start_year}– "
+
+    end_year = start_year + rng.randint(0, 12)
+    return f"{start_year}–{end_year}"
+
+
+def build_duration_text(rng: random.Random, is_series: bool) -> str:
+    if is_series:
+        episodes = rng.randint(6, 250)
+        return f"{episodes} eps"
+
+    hours = rng.randint(1, 3)
+    minutes = rng.randint(0, 59)
+    return f"{hours}h {minutes}m"
+
+
+def build_chart_item(rng: random.Random, position: int, is_series: bool) -> str:
+    title_value = build_title(rng, position)
+    year_text = build_year_text(rng, is_series)
+    duration_text = build_duration_text(rng, is_series)
+    certificate = rng.choice(CERTIFICATES)
+    rating_value = rng.randint(50, 95) / 10
+    vote_count = rng.randint(1, 999)
+    title_id = 100000 + position
+
+    return (
+        "<li class=\"ipc-metadata-list-summary-item sc-10233bc-0 iherUv cli-parent\">"
+        "<div class=\"ipc-metadata-list-summary-item__c\">"
+        "<div class=\"ipc-metadata-list-summary-item__tc\">"
+        "<span class=\"ipc-metadata-list-summary-item__t\" aria-disabled=\"false\"></span>"
+        "<div class=\"sc-b189961a-0 hBZnfJ cli-children\">"
+        "<div class=\"ipc-title ipc-title--base ipc-title--title "
+        "ipc-title-link-no-icon ipc-title--on-textPrimary sc-b189961a-9 iALATN cli-title\">"
+        f"<a href=\"/title/tt{title_id:07d}/?ref_=chttp_t_{position}\" "
+        "class=\"ipc-title-link-wrapper\" tabindex=\"0\">"
+        f"<h3 class=\"ipc-title__text\">{position}. {title_value}</h3></a></div>"
+        "<div class=\"sc-b189961a-7 feoqjK cli-title-metadata\">"
+        f"<span class=\"sc-b189961a-8 kLaxqf cli-title-metadata-item\">{year_text}</span>"
+        f"<span class=\"sc-b189961a-8 kLaxqf cli-title-metadata-item\">{duration_text}</span>"
+        f"<span class=\"sc-b189961a-8 kLaxqf cli-title-metadata-item\">{certificate}</span>"
+        "</div>"
+        "<span class=\"sc-b189961a-1 kcRAsW\">"
+        "<div class=\"sc-e2dbc1a3-0 ajrIH sc-b189961a-2 fkPBP cli-ratings-container\" "
+        "data-testid=\"ratingGroup--container\">"
+        "<span aria-label=\"IMDb rating\" class=\"ipc-rating-star ipc-rating-star--base "
+        "ipc-rating-star--imdb ratingGroup--imdb-rating\" data-testid=\"ratingGroup--imdb-rating\">"
+        "<svg width=\"24\" height=\"24\" class=\"ipc-icon ipc-icon--star-inline\" "
+        "viewBox=\"0 0 24 24\" role=\"presentation\"></svg>"
+        f"<span class=\"ipc-rating-star--rating\">{rating_value:.1f}</span>"
+        f"<span class=\"ipc-rating-star--voteCount\">&nbsp;(<!-- -->{vote_count}K<!-- -->)</span>"
+        "</span></div></span>"
+        "</div></div></div></li>"
+    )
+
+
+def iter_chart_html(n_items: int, seed: int = 42, is_series: bool = False) -> Iterator[str]:
+    rng = random.Random(seed)
+    yield HTML_HEADER
+
+    position = 1
+    while position <= n_items:
+        yield build_chart_item(rng, position, is_series)
+        position = position + 1
+
+    yield HTML_FOOTER
+
+
+def generate_chart_html(n_items: int, seed: int = 42, is_series: bool = False) -> str:
+    return "".join(iter_chart_html(n_items, seed=seed, is_series=is_series))
+
+
+def write_chart_html(
+        path: Path,
+        n_items: int,
+        seed: int = 42,
+        is_series: bool = False,
+) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as file:
+        for chunk in iter_chart_html(n_items, seed=seed, is_series=is_series):
+            file.write(chunk)
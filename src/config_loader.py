@@ -1,6 +1,6 @@
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 import json
 
 
@@ -13,6 +13,11 @@ class Config:
     series_html_source_path: Path
     database_path: Path
     output_directory: Path
+    metrics_path: Optional[Path]
+    metrics_format: str
+    metrics_trace_memory: bool
+    cache_directory: Optional[Path]
+    cache_max_entries: int
 
 
 def load_config(config_path: Path) -> Config:
@@ -53,6 +58,28 @@ def load_config(config_path: Path) -> Config:
         output_rel_path_value = str(raw_data["output_directory"])
     output_dir: Path = (base_dir / output_rel_path_value).resolve()
 
+    metrics_path: Optional[Path] = None
+    if "metrics_path" in raw_data and raw_data["metrics_path"]:
+        metrics_path = (base_dir / str(raw_data["metrics_path"])).resolve()
+
+    metrics_format_value: str = "jsonl"
+    if "metrics_format" in raw_data:
+        metrics_format_value = str(raw_data["metrics_format"])
+
+    metrics_trace_memory_value: bool = True
+    if "metrics_trace_memory" in raw_data:
+        metrics_trace_memory_value = bool(raw_data["metrics_trace_memory"])
+
+    cache_directory: Optional[Path] = (base_dir / "data/cache").resolve()
+    if "cache_directory" in raw_data:
+        cache_directory = None
+        if raw_data["cache_directory"]:
+            cache_directory = (base_dir / str(raw_data["cache_directory"])).resolve()
+
+    cache_max_entries_value: int = 32
+    if "cache_max_entries" in raw_data:
+        cache_max_entries_value = int(raw_data["cache_max_entries"])
+
     config = Config(
         imdb_top_250_url=url_movies_value,
         imdb_top_250_series_url=url_series_value,
@@ -61,5 +88,10 @@ def load_config(config_path: Path) -> Config:
         series_html_source_path=html_series_path,
         database_path=db_path,
         output_directory=output_dir,
+        metrics_path=metrics_path,
+        metrics_format=metrics_format_value,
+        metrics_trace_memory=metrics_trace_memory_value,
+        cache_directory=cache_directory,
+        cache_max_entries=cache_max_entries_value,
     )
     return config
@@ -1,13 +1,20 @@
+import time
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List
+from typing import Dict, List, Optional, Set, Tuple
 
-from sqlalchemy import Column, Float, Integer, String, create_engine
-from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from rich.console import Console
+from sqlalchemy import Column, Float, Integer, String, create_engine, inspect
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session, declarative_base, sessionmaker
 
-from models import Movie, Series
+from instrumentation import measure_stage
+from models import Movie, Series, classify_rating
+from search import create_title_search_index
 
 
+INGEST_BATCH_SIZE: int = 1000
+
 Base = declarative_base()
 
 
@@ -30,51 +37,311 @@ class SeriesModel(Base):
     episodes = Column(Integer, nullable=False)
 
 
+class CategorySummaryModel(Base):
+    __tablename__ = "category_summary"
+
+    categoria = Column(String, primary_key=True)
+    year = Column(Integer, primary_key=True)
+    quantidade = Column(Integer, nullable=False)
+
+
+class DataVersionModel(Base):
+    __tablename__ = "data_version"
+
+    id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False)
+
+
+@dataclass
+class MovieChange:
+    title: str
+    old_year: Optional[int]
+    new_year: Optional[int]
+    old_rating: Optional[float]
+    new_rating: Optional[float]
+    old_category: Optional[str]
+    new_category: Optional[str]
+
+
+@dataclass
+class MovieChangeSet:
+    inserted: List[MovieChange] = field(default_factory=list)
+    updated: List[MovieChange] = field(default_factory=list)
+    removed: List[MovieChange] = field(default_factory=list)
+
+    def is_empty(self) -> bool:
+        return len(self.inserted) == 0 and len(self.updated) == 0 and len(self.removed) == 0
+
+
+def build_movie_change(
+    title: str,
+    old_year: Optional[int],
+    new_year: Optional[int],
+    old_rating: Optional[float],
+    new_rating: Optional[float],
+) -> MovieChange:
+    old_category: Optional[str] = None
+    if old_rating is not None:
+        old_category = classify_rating(old_rating)
+
+    new_category: Optional[str] = None
+    if new_rating is not None:
+        new_category = classify_rating(new_rating)
+
+    change = MovieChange(
+        title=title,
+        old_year=old_year,
+        new_year=new_year,
+        old_rating=old_rating,
+        new_rating=new_rating,
+        old_category=old_category,
+        new_category=new_category,
+    )
+    return change
+
+
 def create_sqlite_engine(database_path: Path):
     database_url: str = f"sqlite:///{database_path}"
     engine = create_engine(database_url, echo=False, future=True)
     return engine
 
 
+def open_existing_database(database_path: Path, required_tables: List[str]):
+    if not database_path.exists():
+        raise RuntimeError(
+            f"Banco de dados não encontrado em {database_path}. Execute o pipeline completo primeiro."
+        )
+
+    database_url: str = f"sqlite:///file:{database_path}?mode=ro&uri=true"
+    engine = create_engine(database_url, echo=False, future=True)
+
+    try:
+        existing_tables = inspect(engine).get_table_names()
+    except SQLAlchemyError as error:
+        engine.dispose()
+        raise RuntimeError(f"Não foi possível abrir o banco de dados {database_path}: {error}") from error
+
+    missing_tables: List[str] = []
+    for table_name in required_tables:
+        if table_name not in existing_tables:
+            missing_tables.append(table_name)
+
+    if len(missing_tables) > 0:
+        engine.dispose()
+        raise RuntimeError(
+            "Tabelas ausentes no banco de dados: "
+            + ", ".join(missing_tables)
+            + ". Execute o pipeline completo primeiro."
+        )
+
+    return engine
+
+
 def create_database_schema(engine) -> None:
     Base.metadata.create_all(engine)
+    ensure_data_version(engine)
+    create_title_search_index(engine)
+
 
+def ensure_data_version(engine) -> None:
+    session_factory = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+    session: Session = session_factory()
+    try:
+        if session.get(DataVersionModel, 1) is None:
+            initial_version = int(time.time() * 1000)
+            session.add(DataVersionModel(id=1, version=initial_version))
+            session.commit()
+    except SQLAlchemyError:
+        session.rollback()
+    finally:
+        session.close()
+
+
+def get_data_version(engine) -> int:
+    session_factory = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+    session: Session = session_factory()
+    try:
+        version_model = session.get(DataVersionModel, 1)
+        if version_model is None:
+            return 0
+        return int(version_model.version)
+    finally:
+        session.close()
 
+
+# Called inside the transaction that changes the data, so readers never see a
+# new version paired with old rows or an old category_summary.
+def bump_data_version(session: Session) -> int:
+    version_model = session.get(DataVersionModel, 1)
+    if version_model is None:
+        version_model = DataVersionModel(id=1, version=0)
+        session.add(version_model)
+    version_model.version = version_model.version + 1
+    return int(version_model.version)
+
+
+def collect_summary_deltas(change_set: MovieChangeSet) -> Dict[Tuple[str, int], int]:
+    deltas: Dict[Tuple[str, int], int] = {}
+
+    def add_delta(category: Optional[str], year: Optional[int], amount: int) -> None:
+        if category is None or year is None:
+            return
+        key = (category, int(year))
+        deltas[key] = deltas.get(key, 0) + amount
+
+    for change in change_set.inserted:
+        add_delta(change.new_category, change.new_year, 1)
+
+    for change in change_set.updated:
+        add_delta(change.old_category, change.old_year, -1)
+        add_delta(change.new_category, change.new_year, 1)
+
+    for change in change_set.removed:
+        add_delta(change.old_category, change.old_year, -1)
+
+    return deltas
+
+
+def apply_summary_deltas(session: Session, deltas: Dict[Tuple[str, int], int]) -> None:
+    for key, amount in deltas.items():
+        if amount == 0:
+            continue
+
+        category, year = key
+        cell = session.get(CategorySummaryModel, (category, year))
+        if cell is None:
+            if amount < 0:
+                continue
+            cell = CategorySummaryModel(categoria=category, year=year, quantidade=0)
+            session.add(cell)
+
+        cell.quantidade = cell.quantidade + amount
+        if cell.quantidade <= 0:
+            session.delete(cell)
+
+
+def update_existing_movie(movie_model: MovieModel, movie: Movie) -> Optional[MovieChange]:
+    old_year = int(movie_model.year)
+    old_rating = float(movie_model.rating)
+    if old_year == movie.year and old_rating == movie.rating:
+        return None
+
+    movie_model.year = movie.year
+    movie_model.rating = movie.rating
+    return build_movie_change(movie.title, old_year, movie.year, old_rating, movie.rating)
+
+
+# Rows and the category_summary cells they affect are written in a single
+# transaction, so an interrupted ingest never leaves the summary behind the data.
 def insert_movies_and_series(
     engine,
     movies: List[Movie],
     series_list: List[Series],
-) -> None:
+) -> MovieChangeSet:
+    console = Console()
+    change_set = MovieChangeSet()
+    series_inserted = 0
+    session_factory = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+    session: Session = session_factory()
+    try:
+        with measure_stage("database.insert_movies_and_series") as stage:
+            for batch_start in range(0, len(movies), INGEST_BATCH_SIZE):
+                movie_batch = movies[batch_start:batch_start + INGEST_BATCH_SIZE]
+                batch_titles = [movie.title for movie in movie_batch]
+
+                movies_by_title: Dict[str, MovieModel] = {}
+                for movie_model in session.query(MovieModel).filter(MovieModel.title.in_(batch_titles)):
+                    movies_by_title[movie_model.title] = movie_model
+
+                for movie in movie_batch:
+                    movie_model = movies_by_title.get(movie.title)
+                    if movie_model is None:
+                        movie_model = MovieModel(
+                            title=movie.title,
+                            year=movie.year,
+                            rating=movie.rating,
+                        )
+                        session.add(movie_model)
+                        movies_by_title[movie.title] = movie_model
+                        stage.add_rows(1)
+                        change_set.inserted.append(
+                            build_movie_change(movie.title, None, movie.year, None, movie.rating)
+                        )
+                        continue
+
+                    change = update_existing_movie(movie_model, movie)
+                    if change is not None:
+                        stage.add_rows(1)
+                        change_set.updated.append(change)
+
+                session.flush()
+
+            for batch_start in range(0, len(series_list), INGEST_BATCH_SIZE):
+                series_batch = series_list[batch_start:batch_start + INGEST_BATCH_SIZE]
+                batch_titles = [series.title for series in series_batch]
+
+                known_titles: Set[str] = set()
+                for (series_title,) in session.query(SeriesModel.title).filter(SeriesModel.title.in_(batch_titles)):
+                    known_titles.add(series_title)
+
+                for series in series_batch:
+                    if series.title in known_titles:
+                        continue
+
+                    session.add(
+                        SeriesModel(
+                            title=series.title,
+                            year=series.year,
+                            seasons=series.seasons,
+                            episodes=series.episodes,
+                        )
+                    )
+                    known_titles.add(series.title)
+                    stage.add_rows(1)
+                    series_inserted = series_inserted + 1
+
+                session.flush()
+
+            apply_summary_deltas(session, collect_summary_deltas(change_set))
+            if not change_set.is_empty() or series_inserted > 0:
+                bump_data_version(session)
+            session.commit()
+    except SQLAlchemyError as error:
+        session.rollback()
+        console.print("Erro ao gravar filmes e séries (nada foi alterado):", str(error), style="bold red")
+        return MovieChangeSet()
+    finally:
+        session.close()
+
+    return change_set
+
+
+def delete_movies(engine, titles: List[str]) -> MovieChangeSet:
+    console = Console()
+    change_set = MovieChangeSet()
     session_factory = sessionmaker(bind=engine, autoflush=False, autocommit=False)
     session: Session = session_factory()
     try:
-        for movie in movies:
-            movie_model = MovieModel(
-                title=movie.title,
-                year=movie.year,
-                rating=movie.rating,
-            )
-            try:
-                session.add(movie_model)
-                session.commit()
-            except IntegrityError:
-                session.rollback()
-            except SQLAlchemyError:
-                session.rollback()
-
-        for series in series_list:
-            series_model = SeriesModel(
-                title=series.title,
-                year=series.year,
-                seasons=series.seasons,
-                episodes=series.episodes,
-            )
-            try:
-                session.add(series_model)
-                session.commit()
-            except IntegrityError:
-                session.rollback()
-            except SQLAlchemyError:
-                session.rollback()
+        for title in titles:
+            movie_model = session.query(MovieModel).filter(MovieModel.title == title).first()
+            if movie_model is None:
+                continue
+
+            old_year = int(movie_model.year)
+            old_rating = float(movie_model.rating)
+            session.delete(movie_model)
+            session.flush()
+            change_set.removed.append(build_movie_change(title, old_year, None, old_rating, None))
+
+        apply_summary_deltas(session, collect_summary_deltas(change_set))
+        if not change_set.is_empty():
+            bump_data_version(session)
+        session.commit()
+    except SQLAlchemyError as error:
+        session.rollback()
+        console.print("Erro ao remover filmes (nada foi alterado):", str(error), style="bold red")
+        return MovieChangeSet()
     finally:
         session.close()
+
+    return change_set
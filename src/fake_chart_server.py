@@ -0,0 +1,215 @@
+import argparse
+import hashlib
+import random
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from email.utils import formatdate, parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from rich.console import Console
+
+from chart_generator import generate_chart_html
+
+console = Console()
+
+MOVIES_CHART_PATH: str = "/chart/top/"
+SERIES_CHART_PATH: str = "/chart/toptv/"
+
+
+@dataclass
+class FakeChartSettings:
+    latency: float = 0.0
+    jitter: float = 0.0
+    error_rate: float = 0.0
+    error_status: int = 503
+    support_conditional: bool = True
+    not_modified_rate: float = 0.0
+    seed: int = 42
+    pages: Dict[str, bytes] = field(default_factory=dict)
+
+
+class FakeChartServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, settings: FakeChartSettings) -> None:
+        super().__init__(address, FakeChartRequestHandler)
+        self.settings: FakeChartSettings = settings
+        self.random_generator = random.Random(settings.seed)
+        self.random_lock = threading.Lock()
+        self.last_modified_timestamp: float = time.time()
+        self.last_modified: str = formatdate(self.last_modified_timestamp, usegmt=True)
+        self.etags: Dict[str, str] = {}
+        for page_path, page_content in settings.pages.items():
+            digest = hashlib.sha1(page_content).hexdigest()
+            self.etags[page_path] = f"\"{digest}\""
+
+    def draw(self) -> float:
+        with self.random_lock:
+            return self.random_generator.random()
+
+    def url_for(self, page_path: str) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}{page_path}"
+
+
+class FakeChartRequestHandler(BaseHTTPRequestHandler):
+    server: FakeChartServer
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        settings = self.server.settings
+
+        delay = settings.latency
+        if settings.jitter > 0:
+            delay = delay + (self.server.draw() * 2 - 1) * settings.jitter
+        if delay > 0:
+            time.sleep(delay)
+
+        page_path = self.path.split("?")[0]
+        if page_path not in settings.pages:
+            self.send_error(404)
+            return
+
+        if settings.error_rate > 0 and self.server.draw() < settings.error_rate:
+            self.send_error(settings.error_status)
+            return
+
+        if self.is_not_modified(page_path):
+            self.send_response(304)
+            self.send_header("ETag", self.server.etags[page_path])
+            self.send_header("Last-Modified", self.server.last_modified)
+            self.end_headers()
+            return
+
+        body = settings.pages[page_path]
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", self.server.etags[page_path])
+        self.send_header("Last-Modified", self.server.last_modified)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def is_not_modified(self, page_path: str) -> bool:
+        settings = self.server.settings
+        if_none_match = self.headers.get("If-None-Match")
+        if_modified_since = self.headers.get("If-Modified-Since")
+        if if_none_match is None and if_modified_since is None:
+            return False
+
+        if settings.not_modified_rate > 0 and self.server.draw() < settings.not_modified_rate:
+            return True
+
+        if not settings.support_conditional:
+            return False
+
+        if if_none_match is not None:
+            return if_none_match == self.server.etags[page_path]
+
+        try:
+            since_timestamp = parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+        return since_timestamp >= int(self.server.last_modified_timestamp)
+
+
+def build_synthetic_pages(n_items: int, seed: int) -> Dict[str, bytes]:
+    pages: Dict[str, bytes] = {}
+    pages[MOVIES_CHART_PATH] = generate_chart_html(n_items, seed=seed).encode("utf-8")
+    pages[SERIES_CHART_PATH] = generate_chart_html(
+        n_items,
+        seed=seed + 1,
+        is_series=True,
+    ).encode("utf-8")
+    return pages
+
+
+def build_recorded_pages(
+        movies_html_path: Optional[Path],
+        series_html_path: Optional[Path],
+) -> Dict[str, bytes]:
+    pages: Dict[str, bytes] = {}
+    if movies_html_path is not None:
+        pages[MOVIES_CHART_PATH] = movies_html_path.read_bytes()
+    if series_html_path is not None:
+        pages[SERIES_CHART_PATH] = series_html_path.read_bytes()
+    return pages
+
+
+def start_fake_chart_server(
+        settings: FakeChartSettings,
+        host: str = "127.0.0.1",
+        port: int = 0,
+) -> FakeChartServer:
+    server = FakeChartServer((host, port), settings)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+def stop_fake_chart_server(server: FakeChartServer) -> None:
+    server.shutdown()
+    server.server_close()
+
+
+def add_server_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--items", type=int, default=250)
+    parser.add_argument("--movies-html", type=Path, default=None)
+    parser.add_argument("--series-html", type=Path, default=None)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--not-modified-rate", type=float, default=0.0)
+    parser.add_argument("--no-conditional", action="store_true")
+    parser.add_argument("--seed", type=int, default=42)
+
+
+def settings_from_arguments(options: argparse.Namespace) -> FakeChartSettings:
+    if options.movies_html is not None or options.series_html is not None:
+        pages = build_recorded_pages(options.movies_html, options.series_html)
+    else:
+        pages = build_synthetic_pages(options.items, options.seed)
+
+    settings = FakeChartSettings(
+        latency=options.latency,
+        jitter=options.jitter,
+        error_rate=options.error_rate,
+        error_status=options.error_status,
+        support_conditional=not options.no_conditional,
+        not_modified_rate=options.not_modified_rate,
+        seed=options.seed,
+        pages=pages,
+    )
+    return settings
+
+
+def main(arguments: List[str]) -> int:
+    parser = argparse.ArgumentParser(description="Servidor local que imita os charts do IMDb.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8250)
+    add_server_arguments(parser)
+    options = parser.parse_args(arguments)
+
+    settings = settings_from_arguments(options)
+    server = FakeChartServer((options.host, options.port), settings)
+
+    console.print(f"Filmes: {server.url_for(MOVIES_CHART_PATH)}", style="green")
+    console.print(f"Séries: {server.url_for(SERIES_CHART_PATH)}", style="green")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        console.print("Servidor encerrado.", style="bold yellow")
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,233 @@
+import json
+import os
+import time
+import tracemalloc
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+METRICS_FORMATS: List[str] = ["jsonl", "prometheus"]
+
+
+class StageMetrics:
+    def __init__(self, recorder: "MetricsRecorder", name: str, parent: Optional[str]) -> None:
+        self.recorder: MetricsRecorder = recorder
+        self.name: str = name
+        self.parent: Optional[str] = parent
+        self.rows: int = 0
+        self.bytes: int = 0
+        self.wall_seconds: float = 0.0
+        self.cpu_seconds: float = 0.0
+        self.peak_bytes: Optional[int] = 0
+        self.observed_peak: int = 0
+        self.start_traced: int = 0
+        self.start_wall: float = 0.0
+        self.start_cpu: float = 0.0
+
+    def add_rows(self, count: int) -> None:
+        self.rows = self.rows + count
+
+    def add_bytes(self, count: int) -> None:
+        self.bytes = self.bytes + count
+
+    def __enter__(self) -> "StageMetrics":
+        self.recorder.push(self)
+        self.start_cpu = time.process_time()
+        self.start_wall = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.wall_seconds = time.perf_counter() - self.start_wall
+        self.cpu_seconds = time.process_time() - self.start_cpu
+        self.recorder.pop(self)
+
+    def to_record(self) -> Dict[str, Any]:
+        record: Dict[str, Any] = {}
+        record["stage"] = self.name
+        record["parent"] = self.parent
+        record["wall_seconds"] = round(self.wall_seconds, 6)
+        record["cpu_seconds"] = round(self.cpu_seconds, 6)
+        record["peak_bytes"] = self.peak_bytes
+        record["rows"] = self.rows
+        record["bytes"] = self.bytes
+        return record
+
+
+class NullStageMetrics:
+    def add_rows(self, count: int) -> None:
+        pass
+
+    def add_bytes(self, count: int) -> None:
+        pass
+
+    def __enter__(self) -> "NullStageMetrics":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        pass
+
+
+NULL_STAGE = NullStageMetrics()
+
+
+# The stage stack is shared by the whole process and is not thread-safe: record
+# metrics only from a single thread (the load test runs with metrics disabled).
+class MetricsRecorder:
+    def __init__(self) -> None:
+        self.enabled: bool = False
+        self.trace_memory: bool = True
+        self.path: Optional[Path] = None
+        self.metrics_format: str = "jsonl"
+        self.run_id: str = ""
+        self.stack: List[StageMetrics] = []
+        self.finished: List[StageMetrics] = []
+        self.started_tracemalloc: bool = False
+
+    def configure(self, path: Optional[Path], metrics_format: str, trace_memory: bool) -> None:
+        if metrics_format not in METRICS_FORMATS:
+            raise ValueError(f"Formato de métricas desconhecido: {metrics_format}")
+
+        self.path = path
+        self.metrics_format = metrics_format
+        self.enabled = path is not None
+        self.trace_memory = trace_memory
+        self.run_id = uuid.uuid4().hex
+        self.stack = []
+        self.finished = []
+
+        if self.enabled and self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.started_tracemalloc = True
+
+    def push(self, stage: StageMetrics) -> None:
+        if not self.trace_memory:
+            self.stack.append(stage)
+            return
+
+        current_traced, peak_traced = tracemalloc.get_traced_memory()
+        if len(self.stack) > 0:
+            parent = self.stack[-1]
+            parent.observed_peak = max(parent.observed_peak, peak_traced)
+        tracemalloc.reset_peak()
+        stage.start_traced = current_traced
+        stage.observed_peak = current_traced
+        self.stack.append(stage)
+
+    def pop(self, stage: StageMetrics) -> None:
+        if not self.trace_memory:
+            stage.peak_bytes = None
+            self.stack.pop()
+            self.finished.append(stage)
+            return
+
+        _, peak_traced = tracemalloc.get_traced_memory()
+        stage_peak = max(stage.observed_peak, peak_traced)
+        stage.peak_bytes = stage_peak - stage.start_traced
+
+        self.stack.pop()
+        if len(self.stack) > 0:
+            parent = self.stack[-1]
+            parent.observed_peak = max(parent.observed_peak, stage_peak)
+
+        self.finished.append(stage)
+
+    def stage(self, name: str):
+        if not self.enabled:
+            return NULL_STAGE
+
+        parent_name: Optional[str] = None
+        if len(self.stack) > 0:
+            parent_name = self.stack[-1].name
+        return StageMetrics(self, name, parent_name)
+
+    def write(self) -> None:
+        if not self.enabled or self.path is None:
+            return
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if self.metrics_format == "prometheus":
+            self.write_prometheus(self.path)
+        else:
+            self.write_jsonl(self.path)
+
+        self.finished = []
+        if self.started_tracemalloc:
+            tracemalloc.stop()
+            self.started_tracemalloc = False
+        self.enabled = False
+
+    def write_jsonl(self, path: Path) -> None:
+        timestamp = datetime.now(timezone.utc).isoformat()
+        with open(path, "a", encoding="utf-8") as file:
+            for stage in self.finished:
+                record = stage.to_record()
+                record["run_id"] = self.run_id
+                record["timestamp"] = timestamp
+                record["pid"] = os.getpid()
+                file.write(json.dumps(record, ensure_ascii=False))
+                file.write("\n")
+
+    def write_prometheus(self, path: Path) -> None:
+        totals: Dict[str, Dict[str, float]] = {}
+        for stage in self.finished:
+            if stage.name not in totals:
+                totals[stage.name] = {
+                    "calls": 0,
+                    "wall_seconds": 0.0,
+                    "cpu_seconds": 0.0,
+                    "peak_bytes": 0,
+                    "rows": 0,
+                    "bytes": 0,
+                }
+            stage_totals = totals[stage.name]
+            stage_totals["calls"] = stage_totals["calls"] + 1
+            stage_totals["wall_seconds"] = stage_totals["wall_seconds"] + stage.wall_seconds
+            stage_totals["cpu_seconds"] = stage_totals["cpu_seconds"] + stage.cpu_seconds
+            if stage.peak_bytes is not None:
+                stage_totals["peak_bytes"] = max(stage_totals["peak_bytes"], stage.peak_bytes)
+            stage_totals["rows"] = stage_totals["rows"] + stage.rows
+            stage_totals["bytes"] = stage_totals["bytes"] + stage.bytes
+
+        metric_definitions = [
+            ("imdb_stage_calls_total", "calls", "counter", "Number of times the stage ran."),
+            ("imdb_stage_wall_seconds", "wall_seconds", "gauge", "Wall time spent in the stage."),
+            ("imdb_stage_cpu_seconds", "cpu_seconds", "gauge", "CPU time spent in the stage."),
+            ("imdb_stage_peak_bytes", "peak_bytes", "gauge", "Peak traced memory above the stage start."),
+            ("imdb_stage_rows_total", "rows", "counter", "Rows processed by the stage."),
+            ("imdb_stage_bytes_total", "bytes", "counter", "Bytes processed by the stage."),
+        ]
+
+        lines: List[str] = []
+        for metric_name, key, metric_type, help_text in metric_definitions:
+            if key == "peak_bytes" and not self.trace_memory:
+                continue
+            lines.append(f"# HELP {metric_name} {help_text}")
+            lines.append(f"# TYPE {metric_name} {metric_type}")
+            for stage_name, stage_totals in totals.items():
+                lines.append(f"{metric_name}{{stage=\"{stage_name}\"}} {stage_totals[key]}")
+
+        with open(path, "w", encoding="utf-8") as file:
+            file.write("\n".join(lines))
+            file.write("\n")
+
+
+recorder = MetricsRecorder()
+
+
+def configure_metrics(
+        path: Optional[Path],
+        metrics_format: str = "jsonl",
+        trace_memory: bool = True,
+) -> None:
+    recorder.configure(path, metrics_format, trace_memory)
+
+
+def measure_stage(name: str):
+    if not recorder.enabled:
+        return NULL_STAGE
+    return recorder.stage(name)
+
+
+def write_metrics() -> None:
+    recorder.write()
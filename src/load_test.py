@@ -0,0 +1,179 @@
+import argparse
+import json
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from rich.console import Console
+from rich.table import Table
+
+from fake_chart_server import (
+    MOVIES_CHART_PATH,
+    add_server_arguments,
+    settings_from_arguments,
+    start_fake_chart_server,
+    stop_fake_chart_server,
+)
+from scraping import download_html_to_file
+
+console = Console()
+
+PERCENTILES: List[int] = [50, 90, 95, 99]
+
+
+def percentile(sorted_values: List[float], rank: int) -> float:
+    if len(sorted_values) == 0:
+        return 0.0
+
+    index_value = int(round(rank / 100 * (len(sorted_values) - 1)))
+    return sorted_values[index_value]
+
+
+def fetch_once(url: str, destination: Path, timeout: float) -> Dict[str, Any]:
+    result: Dict[str, Any] = {}
+    start = time.perf_counter()
+    try:
+        updated = download_html_to_file(url, destination, timeout=timeout)
+        result["ok"] = True
+        result["not_modified"] = not updated
+        result["error"] = ""
+    except RuntimeError as error:
+        result["ok"] = False
+        result["not_modified"] = False
+        result["error"] = str(error)
+    result["seconds"] = time.perf_counter() - start
+    return result
+
+
+def run_load_test(
+        url: str,
+        requests_count: int,
+        concurrency: int,
+        timeout: float,
+        reuse_files: bool,
+) -> Dict[str, Any]:
+    results: List[Dict[str, Any]] = []
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        work_dir = Path(temp_dir)
+
+        def fetch_request(request_index: int) -> Dict[str, Any]:
+            if reuse_files:
+                destination = work_dir / f"worker_{threading.get_ident()}.html"
+            else:
+                destination = work_dir / f"request_{request_index}.html"
+            return fetch_once(url, destination, timeout)
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            futures = []
+            for request_index in range(requests_count):
+                futures.append(executor.submit(fetch_request, request_index))
+            for future in futures:
+                results.append(future.result())
+        elapsed = time.perf_counter() - start
+
+    latencies: List[float] = []
+    errors: Dict[str, int] = {}
+    success_count = 0
+    not_modified_count = 0
+    for result in results:
+        latencies.append(result["seconds"])
+        if result["ok"]:
+            success_count = success_count + 1
+            if result["not_modified"]:
+                not_modified_count = not_modified_count + 1
+        else:
+            error_text = result["error"]
+            errors[error_text] = errors.get(error_text, 0) + 1
+    latencies.sort()
+
+    report: Dict[str, Any] = {}
+    report["url"] = url
+    report["requests"] = requests_count
+    report["concurrency"] = concurrency
+    report["timeout"] = timeout
+    report["elapsed_seconds"] = round(elapsed, 6)
+    report["successes"] = success_count
+    report["downloaded"] = success_count - not_modified_count
+    report["not_modified"] = not_modified_count
+    report["failures"] = requests_count - success_count
+    report["throughput_rps"] = round(requests_count / elapsed, 3) if elapsed > 0 else 0.0
+    report["latency_seconds"] = {}
+    for rank in PERCENTILES:
+        report["latency_seconds"][f"p{rank}"] = round(percentile(latencies, rank), 6)
+    report["latency_seconds"]["max"] = round(latencies[-1], 6) if len(latencies) > 0 else 0.0
+    report["errors"] = errors
+    return report
+
+
+def show_report(report: Dict[str, Any]) -> None:
+    console.rule("[bold cyan]Teste de carga do download[/bold cyan]")
+
+    table = Table(show_header=True, header_style="bold magenta")
+    table.add_column("Métrica")
+    table.add_column("Valor", justify="right")
+
+    table.add_row("URL", report["url"])
+    table.add_row("Requisições", str(report["requests"]))
+    table.add_row("Concorrência", str(report["concurrency"]))
+    table.add_row("Sucessos", str(report["successes"]))
+    table.add_row("Baixados (200)", str(report["downloaded"]))
+    table.add_row("Não modificados (304)", str(report["not_modified"]))
+    table.add_row("Falhas", str(report["failures"]))
+    table.add_row("Vazão (req/s)", f"{report['throughput_rps']:.2f}")
+    for name, seconds in report["latency_seconds"].items():
+        table.add_row(f"Latência {name} (ms)", f"{seconds * 1000:.1f}")
+
+    console.print(table)
+
+    for error_text, count in report["errors"].items():
+        console.print(f"{count}x {error_text}", style="red")
+
+
+def main(arguments: List[str]) -> int:
+    parser = argparse.ArgumentParser(description="Teste de carga da camada de download.")
+    parser.add_argument("--url", default=None)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--timeout", type=float, default=10)
+    parser.add_argument("--reuse-files", action="store_true")
+    parser.add_argument("--output", type=Path, default=None)
+    add_server_arguments(parser)
+    options = parser.parse_args(arguments)
+
+    server = None
+    url: Optional[str] = options.url
+    if url is None:
+        server = start_fake_chart_server(settings_from_arguments(options))
+        url = server.url_for(MOVIES_CHART_PATH)
+
+    try:
+        report = run_load_test(
+            url,
+            options.requests,
+            max(options.concurrency, 1),
+            options.timeout,
+            options.reuse_files,
+        )
+    finally:
+        if server is not None:
+            stop_fake_chart_server(server)
+
+    show_report(report)
+
+    if options.output is not None:
+        options.output.parent.mkdir(parents=True, exist_ok=True)
+        with open(options.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+        console.print(f"Arquivo salvo: {options.output}", style="green")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -1,5 +1,6 @@
+import argparse
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 from rich.console import Console
 from rich.table import Table
@@ -9,24 +10,42 @@ from analysis import (
     add_category_column,
     show_top_movies,
     show_title_rating_category,
-    build_category_summary,
+    select_top_movies,
     export_dataframes,
+    exported_files_are_current,
+    write_export_version,
 )
 from config_loader import Config, load_config
 from database import (
     create_sqlite_engine,
     create_database_schema,
+    get_data_version,
     insert_movies_and_series,
+    open_existing_database,
 )
+from instrumentation import configure_metrics, measure_stage, write_metrics
 from models import Movie, Series, TV
+from result_cache import ResultCache
 from scraping import (
     load_html_from_file,
     extract_chart_items_from_html,
     download_html_to_file,
 )
+from search import SEARCH_TABLE, search_titles
+from summary import load_category_summary, verify_category_summary
 
 console = Console()
 
+REPORT_TABLES: List[str] = ["movies", "series", "category_summary", "data_version"]
+SEARCH_TABLES: List[str] = ["movies", "series", SEARCH_TABLE]
+
+ANALYSIS_RESULT_NAMES: List[str] = [
+    "category_frame",
+    "series_frame",
+    "top_movies",
+    "category_summary",
+]
+
 
 def create_movie_objects(raw_movies: List[Dict[str, Any]]) -> List[Movie]:
     movies: List[Movie] = []
@@ -175,8 +194,11 @@ def show_catalog(catalog: List[TV]) -> None:
 
 def ensure_movies_html(config: Config) -> bool:
     try:
-        download_html_to_file(config.imdb_top_250_url, config.html_source_path)
-        console.print("HTML de filmes atualizado a partir da web.", style="green")
+        updated = download_html_to_file(config.imdb_top_250_url, config.html_source_path)
+        if updated:
+            console.print("HTML de filmes atualizado a partir da web.", style="green")
+        else:
+            console.print("HTML de filmes não mudou desde o último download.", style="green")
         return True
     except RuntimeError as error:
         console.print("Não foi possível atualizar o HTML de filmes a partir da web.", style="bold red")
@@ -189,11 +211,14 @@ def ensure_movies_html(config: Config) -> bool:
 
 def ensure_series_html(config: Config) -> bool:
     try:
-        download_html_to_file(
+        updated = download_html_to_file(
             config.imdb_top_250_series_url,
             config.series_html_source_path,
         )
-        console.print("HTML de séries atualizado a partir da web.", style="green")
+        if updated:
+            console.print("HTML de séries atualizado a partir da web.", style="green")
+        else:
+            console.print("HTML de séries não mudou desde o último download.", style="green")
         return True
     except RuntimeError as error:
         console.print("Não foi possível atualizar o HTML de séries a partir da web.", style="bold yellow")
@@ -209,10 +234,13 @@ def ensure_series_html(config: Config) -> bool:
 
 def load_raw_items_from_html(path: Path, limit: int) -> List[Dict[str, Any]]:
     html_content: str = load_html_from_file(path)
-    raw_items: List[Dict[str, Any]] = extract_chart_items_from_html(
-        html=html_content,
-        limit=limit,
-    )
+    with measure_stage("scraping.extract_chart_items_from_html") as stage:
+        raw_items: List[Dict[str, Any]] = extract_chart_items_from_html(
+            html=html_content,
+            limit=limit,
+        )
+        stage.add_bytes(len(html_content))
+        stage.add_rows(len(raw_items))
     return raw_items
 
 
@@ -232,7 +260,7 @@ def build_catalog(movies: List[Movie], series_list: List[Series]) -> List[TV]:
     return catalog
 
 
-def show_dataframe_preview(dataframe, name: str) -> None:
+def show_dataframe_preview(dataframe, name: str, columns: Optional[List[str]] = None) -> None:
     if dataframe is None:
         console.print("DataFrame de " + name + " não foi carregado.", style="bold yellow")
         console.print()
@@ -248,14 +276,18 @@ def show_dataframe_preview(dataframe, name: str) -> None:
 
     table = Table(show_header=True, header_style="bold magenta")
 
-    for column_name in dataframe.columns:
+    column_names = columns
+    if column_names is None:
+        column_names = list(dataframe.columns)
+
+    for column_name in column_names:
         table.add_column(str(column_name))
 
     head_df = dataframe.head(5)
     for index in head_df.index:
         row = head_df.loc[index]
         row_values: List[str] = []
-        for column_name in dataframe.columns:
+        for column_name in column_names:
             value = row[column_name]
             row_values.append(str(value))
         table.add_row(*row_values)
@@ -315,63 +347,209 @@ def show_summary_table(summary_table) -> None:
         start_index = end_index
 
 
-def main() -> None:
-    base_dir: Path = Path(__file__).resolve().parent.parent
-    config_path: Path = base_dir / "config.json"
-    config: Config = load_config(config_path)
+def show_search_results(query: str, results: List[Dict[str, Any]]) -> None:
+    if len(results) == 0:
+        console.print(f"Nenhum título encontrado para \"{query}\".", style="bold yellow")
+        return
+
+    console.rule(f"[bold cyan]Títulos encontrados para \"{query}\"[/bold cyan]")
+
+    table = Table(show_header=True, header_style="bold magenta")
+    table.add_column("Tipo")
+    table.add_column("Título")
+    table.add_column("Ano", justify="right")
+    table.add_column("Nota", justify="right")
+
+    for result in results:
+        item_type = "Filme"
+        if result["kind"] == "series":
+            item_type = "Série"
+
+        rating_text = "-"
+        if result["rating"] is not None:
+            rating_text = f"{float(result['rating']):.1f}"
+
+        table.add_row(item_type, str(result["title"]), str(result["year"]), rating_text)
+
+    console.print(table)
+
+
+def create_result_cache(config: Config) -> Optional[ResultCache]:
+    if config.cache_directory is None:
+        return None
+    return ResultCache(config.cache_directory, config.cache_max_entries)
+
+
+def load_analysis_results(engine, cache: Optional[ResultCache], data_version: int) -> Dict[str, Any]:
+    if cache is not None:
+        cached_results: Dict[str, Any] = {}
+        for name in ANALYSIS_RESULT_NAMES:
+            value = cache.get(name, data_version)
+            if value is None:
+                break
+            cached_results[name] = value
+
+        if len(cached_results) == len(ANALYSIS_RESULT_NAMES):
+            console.print("Resultados da análise carregados do cache.", style="green")
+            return cached_results
+
+    movies_df, series_df = load_dataframes(engine)
+
+    results: Dict[str, Any] = {}
+    results["category_frame"] = add_category_column(movies_df)
+    results["series_frame"] = series_df
+    results["top_movies"] = select_top_movies(movies_df)
+    results["category_summary"] = load_category_summary(engine)
+
+    if cache is not None:
+        if get_data_version(engine) != data_version:
+            console.print(
+                "Os dados mudaram durante a análise; resultados não foram para o cache.",
+                style="bold yellow",
+            )
+            return results
 
-    movies_html_ok = ensure_movies_html(config)
-    if not movies_html_ok:
+        for name, value in results.items():
+            cache.put(name, data_version, value)
+
+    return results
+
+
+def run_search(config: Config, query: str) -> None:
+    try:
+        engine = open_existing_database(config.database_path, SEARCH_TABLES)
+    except RuntimeError as error:
+        console.print(str(error), style="bold red")
         return
 
-    series_html_ok = ensure_series_html(config)
+    with measure_stage("main.search") as stage:
+        results = search_titles(engine, query, limit=20)
+        stage.add_rows(len(results))
+    show_search_results(query, results)
 
-    raw_movies: List[Dict[str, Any]] = load_raw_items_from_html(
-        path=config.html_source_path,
-        limit=config.n_filmes,
-    )
 
-    raw_series: List[Dict[str, Any]] = []
-    if series_html_ok and config.series_html_source_path.exists():
-        raw_series = load_raw_items_from_html(
-            path=config.series_html_source_path,
+def run_pipeline(config: Config, report_only: bool) -> None:
+    if report_only:
+        try:
+            engine = open_existing_database(config.database_path, REPORT_TABLES)
+        except RuntimeError as error:
+            console.print(str(error), style="bold red")
+            return
+
+        run_report(config, engine)
+        return
+
+    with measure_stage("main.fetch"):
+        movies_html_ok = ensure_movies_html(config)
+        if not movies_html_ok:
+            return
+
+        series_html_ok = ensure_series_html(config)
+
+    with measure_stage("main.parse"):
+        raw_movies: List[Dict[str, Any]] = load_raw_items_from_html(
+            path=config.html_source_path,
             limit=config.n_filmes,
         )
 
+        raw_series: List[Dict[str, Any]] = []
+        if series_html_ok and config.series_html_source_path.exists():
+            raw_series = load_raw_items_from_html(
+                path=config.series_html_source_path,
+                limit=config.n_filmes,
+            )
+
     show_basic_movies_info(raw_movies)
     show_basic_series_info(raw_series)
 
-    movies: List[Movie] = create_movie_objects(raw_movies)
-    scraped_series: List[Series] = create_series_from_scraping(raw_series)
-    series_list: List[Series] = build_series_list(scraped_series)
+    with measure_stage("main.build_objects") as stage:
+        movies: List[Movie] = create_movie_objects(raw_movies)
+        scraped_series: List[Series] = create_series_from_scraping(raw_series)
+        series_list: List[Series] = build_series_list(scraped_series)
 
-    catalog: List[TV] = build_catalog(movies, series_list)
+        catalog: List[TV] = build_catalog(movies, series_list)
+        stage.add_rows(len(catalog))
     show_catalog(catalog)
 
-    engine = create_sqlite_engine(config.database_path)
-    create_database_schema(engine)
-    insert_movies_and_series(engine, movies, series_list)
+    with measure_stage("main.ingest"):
+        engine = create_sqlite_engine(config.database_path)
+        create_database_schema(engine)
+        insert_movies_and_series(engine, movies, series_list)
+        verify_category_summary(engine)
 
-    movies_df, series_df = load_dataframes(engine)
+    run_report(config, engine)
 
-    show_dataframe_preview(movies_df, name="movies")
-    show_dataframe_preview(series_df, name="series")
 
-    show_top_movies(movies_df)
+def run_report(config: Config, engine) -> None:
+    data_version = get_data_version(engine)
 
-    movies_with_category = add_category_column(movies_df)
-    show_title_rating_category(movies_with_category, limit=10)
+    with measure_stage("main.analysis"):
+        results = load_analysis_results(engine, create_result_cache(config), data_version)
+        movies_with_category = results["category_frame"]
+        series_df = results["series_frame"]
 
-    summary_table = build_category_summary(movies_with_category)
-    show_summary_table(summary_table)
+        movie_columns: List[str] = []
+        for column_name in movies_with_category.columns:
+            if column_name != "categoria":
+                movie_columns.append(column_name)
+
+        show_dataframe_preview(movies_with_category, name="movies", columns=movie_columns)
+        show_dataframe_preview(series_df, name="series")
+
+        show_top_movies(movies_with_category, results["top_movies"])
+
+        show_title_rating_category(movies_with_category, limit=10)
+
+        summary_table = results["category_summary"]
+        show_summary_table(summary_table)
+
+    if exported_files_are_current(config.output_directory, data_version):
+        console.print("Arquivos exportados já estão atualizados.", style="green")
+    else:
+        with measure_stage("main.export"):
+            exported = export_dataframes(
+                movies_df=movies_with_category,
+                series_df=series_df,
+                output_dir=config.output_directory,
+            )
+        if exported:
+            write_export_version(config.output_directory, data_version)
 
-    export_dataframes(
-        movies_df=movies_with_category,
-        series_df=series_df,
-        output_dir=config.output_directory,
-    )
     console.print("Processo concluído.", style="bold green")
 
 
+def main() -> None:
+    parser = argparse.ArgumentParser(description="IMDb Top 250: scraping, banco de dados e análise.")
+    parser.add_argument(
+        "--report-only",
+        action="store_true",
+        help="pula download e ingestão e gera apenas o relatório a partir do banco",
+    )
+    parser.add_argument(
+        "--search",
+        default=None,
+        help="busca títulos de filmes e séries no banco e encerra",
+    )
+    options = parser.parse_args()
+
+    base_dir: Path = Path(__file__).resolve().parent.parent
+    config_path: Path = base_dir / "config.json"
+    config: Config = load_config(config_path)
+
+    configure_metrics(
+        config.metrics_path,
+        config.metrics_format,
+        config.metrics_trace_memory,
+    )
+    try:
+        with measure_stage("main"):
+            if options.search is not None:
+                run_search(config, options.search)
+            else:
+                run_pipeline(config, options.report_only)
+    finally:
+        write_metrics()
+
+
 if __name__ == "__main__":
     main()
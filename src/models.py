@@ -1,3 +1,15 @@
+from bisect import bisect_right
+from typing import List
+
+RATING_BINS: List[float] = [float("-inf"), 7.0, 8.0, 9.0, float("inf")]
+RATING_LABELS: List[str] = ["Mediano", "Bom", "Excelente", "Obra-prima"]
+
+
+def classify_rating(rating: float) -> str:
+    position = bisect_right(RATING_BINS, rating) - 1
+    return RATING_LABELS[position]
+
+
 class TV:
     def __init__(self, title: str, year: int) -> None:
         self.title: str = title
@@ -0,0 +1,87 @@
+import os
+import pickle
+from pathlib import Path
+from typing import Any, List, Optional
+
+CACHE_FORMAT_VERSION: int = 1
+CACHE_SUFFIX: str = ".pkl"
+
+
+class ResultCache:
+    def __init__(self, directory: Path, max_entries: int) -> None:
+        self.directory: Path = directory / f"v{CACHE_FORMAT_VERSION}"
+        self.max_entries: int = max_entries
+
+    def entry_path(self, name: str, data_version: int) -> Path:
+        return self.directory / f"{name}-{data_version}{CACHE_SUFFIX}"
+
+    def get(self, name: str, data_version: int) -> Optional[Any]:
+        path = self.entry_path(name, data_version)
+        if not path.exists():
+            return None
+
+        try:
+            with open(path, "rb") as file:
+                value = pickle.load(file)
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+            self.remove(path)
+            return None
+
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return value
+
+    def put(self, name: str, data_version: int, value: Any) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.entry_path(name, data_version)
+        temporary_path = path.with_suffix(".tmp")
+
+        try:
+            with open(temporary_path, "wb") as file:
+                pickle.dump(value, file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temporary_path, path)
+        except OSError:
+            self.remove(temporary_path)
+            return
+
+        self.remove_stale_versions(name, data_version)
+        self.evict()
+
+    def entries(self) -> List[Path]:
+        if not self.directory.exists():
+            return []
+        return list(self.directory.glob(f"*{CACHE_SUFFIX}"))
+
+    def remove_stale_versions(self, name: str, data_version: int) -> None:
+        current_path = self.entry_path(name, data_version)
+        for path in self.directory.glob(f"{name}-*{CACHE_SUFFIX}"):
+            if path == current_path:
+                continue
+            version_text = path.stem[len(name) + 1:]
+            if version_text.isdigit():
+                self.remove(path)
+
+    def evict(self) -> None:
+        entries = self.entries()
+        if len(entries) <= self.max_entries:
+            return
+
+        entries_with_time = []
+        for path in entries:
+            try:
+                entries_with_time.append((path.stat().st_mtime, path))
+            except OSError:
+                continue
+        entries_with_time.sort()
+
+        excess = len(entries_with_time) - self.max_entries
+        for _, path in entries_with_time[:excess]:
+            self.remove(path)
+
+    def remove(self, path: Path) -> None:
+        try:
+            path.unlink()
+        except OSError:
+            pass
@@ -1,3 +1,6 @@
+import os
+import tempfile
+from email.utils import formatdate
 from pathlib import Path
 from typing import Any, Dict, List
 
@@ -6,8 +9,10 @@ from bs4 import BeautifulSoup
 from requests import Response
 from requests.exceptions import RequestException
 
+from instrumentation import measure_stage
 
-def download_html_to_file(url: str, destination: Path) -> None:
+
+def download_html_to_file(url: str, destination: Path, timeout: float = 10) -> bool:
     destination_dir: Path = destination.parent
     destination_dir.mkdir(parents=True, exist_ok=True)
 
@@ -18,21 +23,47 @@ def download_html_to_file(url: str, destination: Path) -> None:
         "Chrome/121.0.0.0 Safari/537.36"
     )
     headers["Accept-Language"] = "en-US,en;q=0.9"
+    if destination.exists():
+        headers["If-Modified-Since"] = formatdate(destination.stat().st_mtime, usegmt=True)
 
-    try:
-        response: Response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
-        text_value: str = response.text
-    except RequestException as error:
-        raise RuntimeError(str(error)) from error
+    with measure_stage("scraping.download_html_to_file") as stage:
+        try:
+            response: Response = requests.get(url, headers=headers, timeout=timeout)
+            response.raise_for_status()
+            text_value: str = response.text
+        except RequestException as error:
+            raise RuntimeError(str(error)) from error
+
+        if response.status_code == 304:
+            if not destination.exists():
+                raise RuntimeError(f"Resposta 304 sem arquivo local em {destination}")
+            return False
+
+        stage.add_bytes(len(response.content))
+        file_descriptor, temporary_name = tempfile.mkstemp(
+            dir=destination_dir,
+            prefix=destination.name,
+            suffix=".tmp",
+        )
+        try:
+            with open(file_descriptor, "w", encoding="utf-8") as file:
+                file.write(text_value)
+            os.replace(temporary_name, destination)
+        except OSError as error:
+            try:
+                os.unlink(temporary_name)
+            except OSError:
+                pass
+            raise RuntimeError(str(error)) from error
 
-    with open(destination, "w", encoding="utf-8") as file:
-        file.write(text_value)
+    return True
 
 
 def load_html_from_file(path: Path) -> str:
-    with open(path, "r", encoding="utf-8") as file:
-        content: str = file.read()
+    with measure_stage("scraping.load_html_from_file") as stage:
+        with open(path, "r", encoding="utf-8") as file:
+            content: str = file.read()
+        stage.add_bytes(len(content))
     return content
 
 
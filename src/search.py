@@ -0,0 +1,133 @@
+import re
+from typing import Any, Dict, List
+
+from rich.console import Console
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+
+SEARCH_TABLE: str = "titles_fts"
+
+# Movies and series share one FTS5 table: a movie with id N is stored under
+# rowid 2N and a series with id N under rowid 2N + 1, so the triggers can
+# update and delete entries by rowid instead of scanning the index.
+CREATE_SEARCH_TABLE_SQL: str = (
+    f"CREATE VIRTUAL TABLE {SEARCH_TABLE} USING fts5("
+    "title, tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"
+)
+
+CREATE_TRIGGER_SQL: List[str] = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS movies_fts_insert AFTER INSERT ON movies BEGIN
+        INSERT INTO {SEARCH_TABLE}(rowid, title) VALUES (new.id * 2, new.title);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS movies_fts_delete AFTER DELETE ON movies BEGIN
+        DELETE FROM {SEARCH_TABLE} WHERE rowid = old.id * 2;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS movies_fts_update AFTER UPDATE OF id, title ON movies BEGIN
+        DELETE FROM {SEARCH_TABLE} WHERE rowid = old.id * 2;
+        INSERT INTO {SEARCH_TABLE}(rowid, title) VALUES (new.id * 2, new.title);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS series_fts_insert AFTER INSERT ON series BEGIN
+        INSERT INTO {SEARCH_TABLE}(rowid, title) VALUES (new.id * 2 + 1, new.title);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS series_fts_delete AFTER DELETE ON series BEGIN
+        DELETE FROM {SEARCH_TABLE} WHERE rowid = old.id * 2 + 1;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS series_fts_update AFTER UPDATE OF id, title ON series BEGIN
+        DELETE FROM {SEARCH_TABLE} WHERE rowid = old.id * 2 + 1;
+        INSERT INTO {SEARCH_TABLE}(rowid, title) VALUES (new.id * 2 + 1, new.title);
+    END
+    """,
+]
+
+BACKFILL_SQL: List[str] = [
+    f"INSERT INTO {SEARCH_TABLE}(rowid, title) SELECT id * 2, title FROM movies",
+    f"INSERT INTO {SEARCH_TABLE}(rowid, title) SELECT id * 2 + 1, title FROM series",
+]
+
+SEARCH_SQL: str = f"""
+    SELECT
+        CASE WHEN fts.rowid % 2 = 0 THEN 'movie' ELSE 'series' END AS kind,
+        fts.rowid / 2 AS item_id,
+        fts.title AS title,
+        COALESCE(movies.year, series.year) AS year,
+        movies.rating AS rating,
+        bm25({SEARCH_TABLE}) AS score
+    FROM {SEARCH_TABLE} AS fts
+    LEFT JOIN movies ON fts.rowid % 2 = 0 AND movies.id = fts.rowid / 2
+    LEFT JOIN series ON fts.rowid % 2 = 1 AND series.id = fts.rowid / 2
+    WHERE {SEARCH_TABLE} MATCH :query
+    ORDER BY score
+    LIMIT :limit
+"""
+
+
+def create_title_search_index(engine) -> None:
+    console = Console()
+
+    try:
+        with engine.begin() as connection:
+            existing = connection.execute(
+                text("SELECT name FROM sqlite_master WHERE type = 'table' AND name = :name"),
+                {"name": SEARCH_TABLE},
+            ).first()
+
+            if existing is None:
+                connection.execute(text(CREATE_SEARCH_TABLE_SQL))
+                for statement in BACKFILL_SQL:
+                    connection.execute(text(statement))
+
+            for statement in CREATE_TRIGGER_SQL:
+                connection.execute(text(statement))
+    except SQLAlchemyError as error:
+        console.print("Não foi possível criar o índice de busca de títulos:", str(error), style="bold yellow")
+
+
+def build_match_query(query: str) -> str:
+    terms: List[str] = re.findall(r"\w+", query, flags=re.UNICODE)
+
+    match_terms: List[str] = []
+    for term in terms:
+        match_terms.append(f"\"{term}\"*")
+    return " ".join(match_terms)
+
+
+def search_titles(engine, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+    console = Console()
+    results: List[Dict[str, Any]] = []
+
+    match_query = build_match_query(query)
+    if match_query == "":
+        return results
+
+    try:
+        with engine.connect() as connection:
+            rows = connection.execute(
+                text(SEARCH_SQL),
+                {"query": match_query, "limit": limit},
+            ).mappings().all()
+    except SQLAlchemyError as error:
+        console.print("Erro ao buscar títulos:", str(error), style="bold red")
+        return results
+
+    for row in rows:
+        result: Dict[str, Any] = {}
+        result["kind"] = row["kind"]
+        result["id"] = int(row["item_id"])
+        result["title"] = row["title"]
+        result["year"] = row["year"]
+        result["rating"] = row["rating"]
+        result["score"] = float(row["score"])
+        results.append(result)
+
+    return results
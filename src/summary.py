@@ -0,0 +1,106 @@
+from typing import Dict, Tuple
+
+import pandas as pd
+from rich.console import Console
+from sqlalchemy import case, func
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session, sessionmaker
+
+from analysis import count_categories_by_year, pivot_category_counts
+from database import CategorySummaryModel, MovieModel, bump_data_version
+from instrumentation import measure_stage
+from models import RATING_BINS, RATING_LABELS
+
+
+def rating_category_expression():
+    conditions = []
+    for position in range(1, len(RATING_BINS) - 1):
+        conditions.append((MovieModel.rating < RATING_BINS[position], RATING_LABELS[position - 1]))
+    return case(*conditions, else_=RATING_LABELS[-1])
+
+
+def count_movies_by_category(session: Session) -> Dict[Tuple[str, int], int]:
+    category = rating_category_expression().label("categoria")
+    rows = (
+        session.query(category, MovieModel.year, func.count(MovieModel.id))
+        .group_by(category, MovieModel.year)
+        .all()
+    )
+
+    counts: Dict[Tuple[str, int], int] = {}
+    for categoria, year, quantidade in rows:
+        counts[(str(categoria), int(year))] = int(quantidade)
+    return counts
+
+
+def load_summary_counts(session: Session) -> Dict[Tuple[str, int], int]:
+    counts: Dict[Tuple[str, int], int] = {}
+    for cell in session.query(CategorySummaryModel).all():
+        counts[(str(cell.categoria), int(cell.year))] = int(cell.quantidade)
+    return counts
+
+
+def rebuild_category_summary(engine) -> None:
+    session_factory = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+    session: Session = session_factory()
+    try:
+        counts = count_movies_by_category(session)
+        session.query(CategorySummaryModel).delete()
+        for key, quantidade in counts.items():
+            categoria, year = key
+            session.add(CategorySummaryModel(categoria=categoria, year=year, quantidade=quantidade))
+        bump_data_version(session)
+        session.commit()
+    except SQLAlchemyError:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+
+def verify_category_summary(engine) -> None:
+    console = Console()
+
+    with measure_stage("summary.verify_category_summary") as stage:
+        session_factory = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+        session: Session = session_factory()
+        try:
+            expected_counts = count_movies_by_category(session)
+            stage.add_rows(len(expected_counts))
+            consistent = expected_counts == load_summary_counts(session)
+        except SQLAlchemyError as error:
+            console.print("Erro ao verificar o resumo por categoria:", str(error), style="bold red")
+            consistent = False
+        finally:
+            session.close()
+
+        if not consistent:
+            try:
+                rebuild_category_summary(engine)
+            except SQLAlchemyError as error:
+                console.print("Erro ao reconstruir o resumo por categoria:", str(error), style="bold red")
+
+
+def load_category_summary(engine) -> pd.DataFrame:
+    console = Console()
+
+    try:
+        counts = pd.read_sql_table(
+            "category_summary",
+            con=engine,
+            columns=["categoria", "year", "quantidade"],
+        )
+    except SQLAlchemyError as error:
+        console.print("Erro ao ler tabela category_summary:", str(error), style="bold red")
+        return pd.DataFrame()
+    except ValueError as error:
+        console.print("Erro ao ler tabela category_summary:", str(error), style="bold red")
+        return pd.DataFrame()
+
+    return pivot_category_counts(counts)
+
+
+def summary_matches_full_recompute(engine) -> bool:
+    full_summary = pivot_category_counts(count_categories_by_year(engine))
+    persisted_summary = load_category_summary(engine)
+    return full_summary.equals(persisted_summary)
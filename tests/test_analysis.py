@@ -0,0 +1,23 @@
+import pandas as pd
+
+from analysis import classify_ratings
+from models import RATING_BINS, RATING_LABELS, classify_rating
+
+
+def test_scalar_and_vectorised_classification_agree():
+    ratings = [0.0, 6.9, 7.0, 7.5, 7.9, 8.0, 8.9, 9.0, 9.3, 10.0]
+    for inner_edge in RATING_BINS[1:-1]:
+        ratings.append(inner_edge)
+
+    vectorised = classify_ratings(pd.Series(ratings, dtype="float32")).astype(str).tolist()
+    scalar = [classify_rating(rating) for rating in ratings]
+
+    assert scalar == vectorised
+    assert set(scalar) == set(RATING_LABELS)
+
+
+def test_classify_rating_boundaries():
+    assert classify_rating(6.9) == "Mediano"
+    assert classify_rating(7.0) == "Bom"
+    assert classify_rating(8.0) == "Excelente"
+    assert classify_rating(9.0) == "Obra-prima"
@@ -0,0 +1,149 @@
+import pandas as pd
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+
+import database
+import summary
+from analysis import add_category_column, build_category_summary, load_dataframes
+from database import (
+    create_database_schema,
+    create_sqlite_engine,
+    delete_movies,
+    get_data_version,
+    insert_movies_and_series,
+)
+from models import Movie, Series
+from summary import load_category_summary, summary_matches_full_recompute, verify_category_summary
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_sqlite_engine(tmp_path / "test.db")
+    create_database_schema(engine)
+    yield engine
+    engine.dispose()
+
+
+def build_movies() -> list:
+    movies = []
+    index_value = 0
+    while index_value < 40:
+        rating_value = 6.0 + (index_value % 40) / 10
+        movies.append(Movie(f"Filme {index_value}", 1990 + index_value % 4, rating_value))
+        index_value = index_value + 1
+    return movies
+
+
+def full_recompute(engine) -> pd.DataFrame:
+    movies_df, _ = load_dataframes(engine)
+    return build_category_summary(add_category_column(movies_df))
+
+
+def assert_summary_matches_full_recompute(engine) -> None:
+    persisted_summary = load_category_summary(engine)
+    expected_summary = full_recompute(engine)
+    pd.testing.assert_frame_equal(persisted_summary, expected_summary)
+
+
+def test_incremental_updates_match_full_recompute(engine, monkeypatch):
+    def fail_rebuild(engine):
+        raise AssertionError("o resumo deveria ser atualizado incrementalmente")
+
+    monkeypatch.setattr(summary, "rebuild_category_summary", fail_rebuild)
+
+    change_set = insert_movies_and_series(engine, build_movies(), [Series("Série 1", 2000, 1, 1)])
+    assert len(change_set.inserted) == 40
+    version_after_insert = get_data_version(engine)
+    assert_summary_matches_full_recompute(engine)
+    verify_category_summary(engine)
+
+    changed_movies = [
+        Movie("Filme 0", 1990, 9.5),
+        Movie("Filme 1", 2020, 6.1),
+        Movie("Filme 35", 1993, 7.2),
+        Movie("Filme 2", 1992, 6.2),
+    ]
+    change_set = insert_movies_and_series(engine, changed_movies, [])
+    assert len(change_set.inserted) == 0
+    assert len(change_set.updated) == 3
+    assert get_data_version(engine) == version_after_insert + 1
+
+    updated_by_title = {change.title: change for change in change_set.updated}
+    assert updated_by_title["Filme 0"].old_category == "Mediano"
+    assert updated_by_title["Filme 0"].new_category == "Obra-prima"
+    assert updated_by_title["Filme 1"].old_year == 1991
+    assert updated_by_title["Filme 1"].new_year == 2020
+    assert updated_by_title["Filme 35"].old_category == "Obra-prima"
+    assert updated_by_title["Filme 35"].new_category == "Bom"
+
+    assert_summary_matches_full_recompute(engine)
+    verify_category_summary(engine)
+
+    change_set = delete_movies(engine, ["Filme 3", "Filme 1", "Filme inexistente"])
+    assert len(change_set.removed) == 2
+    assert_summary_matches_full_recompute(engine)
+    verify_category_summary(engine)
+    assert 2020 not in load_category_summary(engine).columns
+
+
+def test_rebuilds_when_summary_total_drifts(engine):
+    insert_movies_and_series(engine, build_movies(), [])
+    version_before_drift = get_data_version(engine)
+
+    with engine.begin() as connection:
+        connection.execute(text("DELETE FROM category_summary WHERE year = 1990"))
+        connection.execute(text("UPDATE category_summary SET quantidade = quantidade + 5"))
+
+    verify_category_summary(engine)
+    assert_summary_matches_full_recompute(engine)
+    assert get_data_version(engine) == version_before_drift + 1
+
+    verify_category_summary(engine)
+    assert get_data_version(engine) == version_before_drift + 1
+
+
+def test_rebuilds_when_only_a_rating_drifts(engine):
+    insert_movies_and_series(engine, [Movie("Filme A", 2000, 6.0), Movie("Filme B", 2000, 7.5)], [])
+
+    with engine.begin() as connection:
+        connection.execute(text("UPDATE movies SET rating = 9.5 WHERE title = 'Filme A'"))
+    assert not summary_matches_full_recompute(engine)
+
+    insert_movies_and_series(engine, [Movie("Filme A", 2000, 9.5)], [])
+    verify_category_summary(engine)
+    assert_summary_matches_full_recompute(engine)
+    assert load_category_summary(engine).loc["Obra-prima", 2000] == 1
+
+
+def test_failed_summary_update_rolls_back_the_rows(engine, monkeypatch):
+    insert_movies_and_series(engine, build_movies(), [])
+    version_before = get_data_version(engine)
+
+    def fail_apply(session, deltas):
+        raise SQLAlchemyError("falha simulada")
+
+    monkeypatch.setattr(database, "apply_summary_deltas", fail_apply)
+
+    change_set = insert_movies_and_series(
+        engine,
+        [Movie("Filme 0", 1990, 9.5), Movie("Filme novo", 2001, 8.0)],
+        [],
+    )
+    assert change_set.is_empty()
+    assert get_data_version(engine) == version_before
+    assert_summary_matches_full_recompute(engine)
+
+    movies_df, _ = load_dataframes(engine)
+    assert "Filme novo" not in set(movies_df["title"])
+    assert float(movies_df.loc[movies_df["title"] == "Filme 0", "rating"].iloc[0]) == 6.0
+
+
+def test_seeds_summary_for_existing_movies(engine):
+    insert_movies_and_series(engine, build_movies(), [])
+
+    with engine.begin() as connection:
+        connection.execute(text("DELETE FROM category_summary"))
+
+    verify_category_summary(engine)
+    assert_summary_matches_full_recompute(engine)